@@ -4,13 +4,134 @@ Utility functions for interacting with a MySQL database.
 This module provides functions to execute MySQL queries within a Docker container
 and retrieve key database schema information such as table names and foreign keys.
 """
+import csv
+import hashlib
+import io
+import json
+import os
 import subprocess
 import sys
+import threading
+
+# On-disk cache of schema metadata, keyed by a schema-version tag. Repeat
+# runs against an unchanged schema skip the docker/mysql round-trips.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tracer")
+
+class MySQLSession:
+    """
+    A persistent mysql client running inside a Docker container.
+
+    A single `docker exec -i ... mysql` process is started once; queries are
+    written to its stdin and results read back from stdout, delimited by a
+    sentinel row. This avoids paying the `docker exec` fork and mysql client
+    handshake cost (easily 100-300 ms) for every query.
+    """
+
+    _SENTINEL = "---END---"
+
+    def __init__(self, db_container, db_user, db_pass, db_name):
+        # The password goes in via MYSQL_PWD rather than -p so the client
+        # does not print its insecure-password warning, which would land
+        # in the merged output stream as a phantom data row.
+        cmd = [
+            "docker", "exec", "-e", f"MYSQL_PWD={db_pass}", "-i", db_container,
+            "mysql", "-u", db_user,
+            "--batch", "--skip-column-names", "--force", db_name
+        ]
+        try:
+            # stderr is merged into stdout so mysql error lines surface in
+            # run() instead of deadlocking an unread pipe. The pipes stay
+            # in bytes mode; output is decoded once per query in run().
+            self._proc = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+            )
+        except FileNotFoundError:
+            print("Error: 'docker' command not found. Is Docker installed and in your PATH?")
+            sys.exit(1)
+        self._lock = threading.Lock()
+
+    def alive(self):
+        """Returns True while the underlying mysql process is still running."""
+        return self._proc.poll() is None
+
+    def run(self, query):
+        """
+        Executes a query on the persistent session and returns its output.
+
+        Args:
+            query (str): The MySQL query to execute.
+
+        Returns:
+            str: The query output, as the mysql batch format produces it.
+
+        Raises:
+            RuntimeError: If the query fails or the session has died.
+        """
+        with self._lock:
+            if not self.alive():
+                raise RuntimeError("MySQL session has exited.")
+
+            statement = query.strip().rstrip(";")
+            self._proc.stdin.write(
+                f"{statement};\nSELECT '{self._SENTINEL}';\n".encode('utf-8')
+            )
+            self._proc.stdin.flush()
+
+            # Collect raw bytes and decode the whole result once, rather
+            # than routing every line through an incremental decoder.
+            sentinel = self._SENTINEL.encode('utf-8')
+            lines = []
+            errors = []
+            for line in self._proc.stdout:
+                line = line.rstrip(b"\n")
+                if line == sentinel:
+                    break
+                if line.startswith(b"ERROR "):
+                    errors.append(line)
+                elif line.startswith(b"mysql: "):
+                    # Client warnings on the merged stderr are not rows
+                    continue
+                else:
+                    lines.append(line)
+            else:
+                detail = b"; ".join(errors or lines).decode('utf-8', 'replace')
+                raise RuntimeError(f"MySQL session closed unexpectedly: {detail}")
+
+            if errors:
+                raise RuntimeError(b"; ".join(errors).decode('utf-8', 'replace'))
+            return b"\n".join(lines).decode('utf-8', 'replace')
+
+    def close(self):
+        """Shuts the session down and waits for the mysql process to exit."""
+        if self.alive():
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+        self._proc.wait()
+
+# Sessions are shared per connection tuple so repeated queries reuse one
+# mysql process instead of forking `docker exec` each time.
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def _get_session(db_container, db_user, db_pass, db_name):
+    key = (db_container, db_user, db_pass, db_name)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None or not session.alive():
+            session = MySQLSession(db_container, db_user, db_pass, db_name)
+            _sessions[key] = session
+        return session
 
 def run_mysql(db_container, db_user, db_pass, db_name, query):
     """
     Executes a MySQL query inside the specified Docker container.
 
+    Queries are routed through a shared persistent MySQLSession for the
+    given connection details.
+
     Args:
         db_container (str): The name of the Docker container.
         db_user (str): The database username.
@@ -20,27 +141,75 @@ def run_mysql(db_container, db_user, db_pass, db_name, query):
 
     Returns:
         str: The standard output from the MySQL command.
-    
+
     Raises:
-        subprocess.CalledProcessError: If the MySQL command fails.
+        RuntimeError: If the query fails.
     """
-    cmd = [
-        "docker", "exec", "-i", db_container,
-        "mysql", "-u", db_user, f"-p{db_pass}",
-        "--batch", "--skip-column-names", db_name,
-        "-e", query
-    ]
+    session = _get_session(db_container, db_user, db_pass, db_name)
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True, encoding='utf-8')
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
+        return session.run(query)
+    except RuntimeError as e:
         print(f"Error running MySQL command: {e}")
-        print(f"Stdout: {e.stdout}")
-        print(f"Stderr: {e.stderr}")
         raise
-    except FileNotFoundError:
-        print("Error: 'docker' command not found. Is Docker installed and in your PATH?")
-        sys.exit(1)
+
+_schema_tags = {}
+
+def schema_version(db_container, db_user, db_pass, db_name):
+    """
+    Probes the database for a cheap schema-version tag.
+
+    The probe hashes the latest table update time and the table count, so
+    the tag changes whenever the schema does. The result is memoized per
+    connection for the lifetime of the process.
+
+    Args:
+        db_container (str): The name of the Docker container.
+        db_user (str): The database username.
+        db_pass (str): The database password.
+        db_name (str): The name of the database.
+
+    Returns:
+        str: An 8-character hex tag identifying the schema state.
+    """
+    key = (db_container, db_user, db_pass, db_name)
+    tag = _schema_tags.get(key)
+    if tag is None:
+        query = """
+        SELECT MAX(UPDATE_TIME), COUNT(*) FROM information_schema.tables
+        WHERE TABLE_SCHEMA = DATABASE();
+        """
+        probe = run_mysql(db_container, db_user, db_pass, db_name, query)
+        tag = hashlib.blake2b(probe.encode('utf-8'), digest_size=4).hexdigest()
+        _schema_tags[key] = tag
+    return tag
+
+def _cache_get(db_name, tag, key):
+    """Returns the cached entry for (tag, key), or None on any miss."""
+    try:
+        with open(os.path.join(CACHE_DIR, f"{db_name}.json"), encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cached.get(tag, {}).get(key)
+
+def _cache_set(db_name, tag, key, value):
+    """Stores an entry under (tag, key), dropping entries for stale tags."""
+    path = os.path.join(CACHE_DIR, f"{db_name}.json")
+    try:
+        with open(path, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+    if tag not in cached:
+        cached = {tag: {}}
+    cached[tag][key] = value
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path, "w", encoding='utf-8') as f:
+            json.dump(cached, f)
+    except OSError:
+        # The cache is best-effort; failing to persist it is not fatal.
+        pass
 
 def get_tables(db_container, db_user, db_pass, db_name):
     """
@@ -55,9 +224,69 @@ def get_tables(db_container, db_user, db_pass, db_name):
     Returns:
         list: A list of table names.
     """
+    tag = schema_version(db_container, db_user, db_pass, db_name)
+    cached = _cache_get(db_name, tag, "tables")
+    if cached is not None:
+        return cached
+
     query = "SHOW TABLES;"
     tables_str = run_mysql(db_container, db_user, db_pass, db_name, query)
-    return tables_str.split("\n")
+    # splitlines()/strip() avoids returning [""] for an empty database,
+    # which would otherwise be processed as a table named "".
+    tables = [t.strip() for t in tables_str.splitlines() if t.strip()]
+
+    _cache_set(db_name, tag, "tables", tables)
+    return tables
+
+def get_all_columns(db_container, db_user, db_pass, db_name):
+    """
+    Retrieves column metadata for every table in the database in a single query.
+
+    Querying INFORMATION_SCHEMA.COLUMNS once avoids issuing a separate
+    `DESCRIBE` (and therefore a separate `docker exec` + mysql client
+    invocation) per table.
+
+    Args:
+        db_container (str): The name of the Docker container.
+        db_user (str): The database username.
+        db_pass (str): The database password.
+        db_name (str): The name of the database.
+
+    Returns:
+        dict: A mapping of table name to a list of
+            `(column, type, nullable, key, default, extra, comment)` tuples,
+            ordered by ordinal position.
+    """
+    tag = schema_version(db_container, db_user, db_pass, db_name)
+    cached = _cache_get(db_name, tag, "columns")
+    if cached is not None:
+        return {table: [tuple(col) for col in cols] for table, cols in cached.items()}
+
+    query = """
+    SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY,
+           COLUMN_DEFAULT, EXTRA, COLUMN_COMMENT
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+    ORDER BY TABLE_NAME, ORDINAL_POSITION;
+    """
+    result = run_mysql(db_container, db_user, db_pass, db_name, query)
+
+    cols_by_table = {}
+    reader = csv.reader(io.StringIO(result), delimiter='\t', quoting=csv.QUOTE_NONE)
+    for parts in reader:
+        if not parts or not parts[0]:
+            continue
+
+        # Pad out trailing empty fields (COLUMN_COMMENT is often blank)
+        parts = (parts + [""] * 8)[:8]
+
+        table = parts[0]
+        cols_by_table.setdefault(table, []).append(tuple(parts[1:8]))
+
+    _cache_set(db_name, tag, "columns", {
+        table: [list(col) for col in cols] for table, cols in cols_by_table.items()
+    })
+    return cols_by_table
 
 def get_foreign_key_map(db_container, db_user, db_pass, db_name):
     """
@@ -74,22 +303,28 @@ def get_foreign_key_map(db_container, db_user, db_pass, db_name):
     Returns:
         dict: A dictionary mapping foreign key columns to their referenced tables/columns.
     """
-    query = f"""
+    tag = schema_version(db_container, db_user, db_pass, db_name)
+    cached = _cache_get(db_name, tag, "fk_map")
+    if cached is not None:
+        return {(t, col): (ref_t, ref_c) for t, col, ref_t, ref_c in cached}
+
+    query = """
     SELECT TABLE_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
     FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
-    WHERE TABLE_SCHEMA = '{db_name}' AND REFERENCED_TABLE_NAME IS NOT NULL;
+    WHERE TABLE_SCHEMA = DATABASE() AND REFERENCED_TABLE_NAME IS NOT NULL;
     """
-    fk_rows = run_mysql(db_container, db_user, db_pass, db_name, query).split("\n")
+    result = run_mysql(db_container, db_user, db_pass, db_name, query)
 
     fk_map = {}
-    for row in fk_rows:
-        if not row.strip():
-            continue
-        try:
-            t, col, ref_t, ref_c = row.split("\t")
-            fk_map[(t, col)] = (ref_t, ref_c)
-        except ValueError:
-            # Handle malformed rows or unexpected output
+    reader = csv.reader(io.StringIO(result), delimiter='\t', quoting=csv.QUOTE_NONE)
+    for parts in reader:
+        # Skip blank or malformed rows
+        if len(parts) != 4:
             continue
-            
+        t, col, ref_t, ref_c = parts
+        fk_map[(t, col)] = (ref_t, ref_c)
+
+    _cache_set(db_name, tag, "fk_map", [
+        [t, col, ref_t, ref_c] for (t, col), (ref_t, ref_c) in fk_map.items()
+    ])
     return fk_map
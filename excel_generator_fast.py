@@ -0,0 +1,342 @@
+"""
+Direct-XML Excel writer for very large schemas.
+
+This module produces the same documentation workbook as excel_generator, but
+writes the xlsx parts (a ZIP of XML files) by hand instead of going through
+openpyxl's object model. Cells are emitted as inline strings with a small
+fixed set of pre-baked styles, so generation cost is pure string formatting,
+XML escaping and ZIP I/O.
+"""
+import logging
+import zipfile
+from datetime import datetime
+from xml.sax.saxutils import escape
+from db_utils import get_all_columns
+from excel_generator import LETTERS, PROGRESS_INTERVAL, build_sheet_name_map
+
+logger = logging.getLogger(__name__)
+
+# Style indexes into the pre-baked cellXfs table in _STYLES_XML.
+STYLE_DEFAULT = 0
+STYLE_TITLE = 1
+STYLE_HEADER = 2
+STYLE_CELL = 3
+STYLE_HYPERLINK = 4
+STYLE_SUMMARY_TITLE = 5
+STYLE_DATE = 6
+
+_XMLNS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_XMLNS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '{sheet_overrides}'
+    '</Types>'
+)
+
+_ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+# Fonts: 0 default, 1 bold, 2 title (bold white 14pt), 3 hyperlink (bold blue
+# underline), 4 summary title (bold 14pt), 5 date (italic gray).
+# Fills: 0/1 are the mandatory none/gray125 entries, 2 header green, 3 title blue.
+# Borders: 0 none, 1 thin on all sides.
+_STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<styleSheet xmlns="{_XMLNS}">'
+    '<fonts count="6">'
+    '<font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="14"/><color rgb="FFFFFFFF"/><name val="Calibri"/></font>'
+    '<font><b/><u/><sz val="11"/><color rgb="FF0563C1"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="14"/><name val="Calibri"/></font>'
+    '<font><i/><sz val="11"/><color rgb="FF555555"/><name val="Calibri"/></font>'
+    '</fonts>'
+    '<fills count="4">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFD9EAD3"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FF305496"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="2">'
+    '<border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border>'
+    '<left style="thin"><color rgb="FF000000"/></left>'
+    '<right style="thin"><color rgb="FF000000"/></right>'
+    '<top style="thin"><color rgb="FF000000"/></top>'
+    '<bottom style="thin"><color rgb="FF000000"/></bottom>'
+    '<diagonal/>'
+    '</border>'
+    '</borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="7">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="2" fillId="3" borderId="0" xfId="0" applyFont="1" applyFill="1" applyAlignment="1">'
+    '<alignment horizontal="left" vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="1" xfId="0" applyBorder="1"/>'
+    '<xf numFmtId="0" fontId="3" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="0" fontId="4" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="0" fontId="5" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+class SheetXMLWriter:
+    """
+    Streams one worksheet's XML directly into the workbook archive.
+
+    Rows are buffered as formatted XML strings so the ``<cols>`` block
+    (which must precede ``<sheetData>``) can be derived from the data,
+    then the whole sheet is written to the ZIP entry in one pass.
+    """
+
+    def __init__(self, zf, index):
+        self._zf = zf
+        self._arcname = f"xl/worksheets/sheet{index}.xml"
+        self._rows = []
+        self._row_idx = 0
+        self._col_widths = []
+        self._freeze = None
+        self._merges = []
+        self._hyperlinks = []
+
+    def set_freeze(self, y_split):
+        """Freezes the top y_split rows of the sheet."""
+        self._freeze = y_split
+
+    def set_col_widths(self, widths):
+        """Sets explicit column widths, one per column starting at A."""
+        self._col_widths = widths
+
+    def merge(self, ref):
+        """Records a merged cell range, e.g. ``"A1:G1"``."""
+        self._merges.append(ref)
+
+    def add_row(self, cells):
+        """
+        Appends one row.
+
+        Args:
+            cells (list): Per-column entries, each either None (skip the
+                column) or a `(value, style_id)` / `(value, style_id,
+                hyperlink_location)` tuple.
+        """
+        self._row_idx += 1
+        parts = [f'<row r="{self._row_idx}">']
+        for col_idx, cell in enumerate(cells, start=1):
+            if cell is None:
+                continue
+            value, style = cell[0], cell[1]
+            ref = f"{LETTERS[col_idx - 1]}{self._row_idx}"
+            text = escape(str(value))
+            parts.append(f'<c r="{ref}" s="{style}" t="inlineStr"><is><t>{text}</t></is></c>')
+            if len(cell) > 2 and cell[2]:
+                self._hyperlinks.append((ref, cell[2], str(value)))
+        parts.append('</row>')
+        self._rows.append("".join(parts))
+
+    def close(self):
+        """Writes the buffered sheet into the archive."""
+        with self._zf.open(self._arcname, "w", force_zip64=True) as fh:
+            out = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                   f'<worksheet xmlns="{_XMLNS}">']
+            if self._freeze:
+                top_left = f"A{self._freeze + 1}"
+                out.append(
+                    '<sheetViews><sheetView workbookViewId="0">'
+                    f'<pane ySplit="{self._freeze}" topLeftCell="{top_left}" '
+                    'activePane="bottomLeft" state="frozen"/>'
+                    '</sheetView></sheetViews>'
+                )
+            if self._col_widths:
+                out.append('<cols>')
+                for i, width in enumerate(self._col_widths, start=1):
+                    out.append(f'<col min="{i}" max="{i}" width="{width}" customWidth="1"/>')
+                out.append('</cols>')
+            out.append('<sheetData>')
+            out.extend(self._rows)
+            out.append('</sheetData>')
+            if self._merges:
+                out.append(f'<mergeCells count="{len(self._merges)}">')
+                for ref in self._merges:
+                    out.append(f'<mergeCell ref="{ref}"/>')
+                out.append('</mergeCells>')
+            if self._hyperlinks:
+                out.append('<hyperlinks>')
+                for ref, location, display in self._hyperlinks:
+                    out.append(
+                        f'<hyperlink ref="{ref}" location="{escape(location, {chr(34): "&quot;"})}" '
+                        f'display="{escape(display, {chr(34): "&quot;"})}"/>'
+                    )
+                out.append('</hyperlinks>')
+            out.append('</worksheet>')
+            fh.write("".join(out).encode("utf-8"))
+
+def _sheet_anchor(sheet_name):
+    """Builds a hyperlink location pointing at a sheet's top-left cell."""
+    return f"'{sheet_name}'!A1"
+
+def generate_excel_doc_fast(output_file, db_container, db_user, db_pass, db_name, tables, fk_map):
+    """
+    Generates the documentation workbook via direct XML streaming.
+
+    Produces the same layout as excel_generator.generate_excel_doc but
+    bypasses openpyxl entirely, which pays off on schemas with thousands
+    of tables.
+
+    Args:
+        output_file (str): The path and name for the output Excel file.
+        db_container (str): The name of the Docker container.
+        db_user (str): The database username.
+        db_pass (str): The database password.
+        db_name (str): The name of the database.
+        tables (list): A list of table names to document.
+        fk_map (dict): A dictionary mapping foreign key columns to their referenced tables/columns.
+    """
+    cols_by_table = get_all_columns(db_container, db_user, db_pass, db_name)
+
+    table_to_sheet = build_sheet_name_map(tables)
+    sheet_anchor = {t: _sheet_anchor(s) for t, s in table_to_sheet.items()}
+    sheet_names = ["Tables"] + [table_to_sheet[t] for t in tables]
+    headers = ["Physical Column Name", "Type", "Primary Key", "Allow NULL", "Default Value", "Extra", "Comment"]
+
+    # compresslevel=1: the workbook is write-once, so trade a slightly
+    # larger file for a much faster save.
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        sheet_overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, len(sheet_names) + 1)
+        )
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES_XML.format(sheet_overrides=sheet_overrides))
+        zf.writestr("_rels/.rels", _ROOT_RELS_XML)
+        zf.writestr("xl/styles.xml", _STYLES_XML)
+
+        sheets_xml = "".join(
+            f'<sheet name="{escape(name, {chr(34): "&quot;"})}" sheetId="{i}" r:id="rId{i}"/>'
+            for i, name in enumerate(sheet_names, start=1)
+        )
+        zf.writestr(
+            "xl/workbook.xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<workbook xmlns="{_XMLNS}" xmlns:r="{_XMLNS_R}">'
+            f'<sheets>{sheets_xml}</sheets></workbook>'
+        )
+        rels_xml = "".join(
+            f'<Relationship Id="rId{i}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            f'Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, len(sheet_names) + 1)
+        )
+        styles_rid = len(sheet_names) + 1
+        zf.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'{rels_xml}'
+            f'<Relationship Id="rId{styles_rid}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+            'Target="styles.xml"/>'
+            '</Relationships>'
+        )
+
+        # Summary sheet
+        summary = SheetXMLWriter(zf, 1)
+        summary.set_freeze(4)
+        summary.merge("A1:B1")
+        summary.merge("A2:B2")
+        title_text = "📖 PMS Database Documentation"
+        summary_width = max([len(title_text), len("Table Name")] + [len(t) for t in tables])
+        summary.set_col_widths([summary_width + 2, len("Go to Sheet") + 2])
+        summary.add_row([(title_text, STYLE_SUMMARY_TITLE)])
+        date_text = f"Documentation Date: {datetime.now().strftime('%B %d, %Y %I:%M %p')}"
+        summary.add_row([(date_text, STYLE_DATE)])
+        summary.add_row([])
+        summary.add_row([("Table Name", STYLE_HEADER), ("Go to Sheet", STYLE_HEADER)])
+        for table in tables:
+            # Tables without column metadata get no summary row, matching
+            # the openpyxl writer
+            if not cols_by_table.get(table):
+                continue
+            summary.add_row([(table, STYLE_CELL), ("Go", STYLE_HYPERLINK, sheet_anchor[table])])
+        summary.close()
+
+        # One sheet per table
+        for sheet_idx, table in enumerate(tables, start=2):
+            idx = sheet_idx - 1
+            if idx % PROGRESS_INTERVAL == 0 or idx == len(tables):
+                logger.info("  → Processed %d/%d tables", idx, len(tables))
+            writer = SheetXMLWriter(zf, sheet_idx)
+            writer.set_freeze(3)
+            writer.merge("A1:G1")
+
+            columns = cols_by_table.get(table, [])
+            if not columns:
+                # Leave the sheet empty, as the openpyxl writer does
+                logger.warning("No column metadata found for table %s.", table)
+                writer.close()
+                continue
+
+            rows = []
+            col_widths = [len(h) for h in headers]
+            for col, col_type, nullable, key, default, extra, comment in columns:
+                if key == "PRI":
+                    key_val = "PRI"
+                elif key == "MUL":
+                    key_val = "FK"
+                elif key == "UNI":
+                    key_val = "UNI"
+                else:
+                    key_val = "-"
+
+                if nullable == "NO" and default == "NULL":
+                    default_val = ""
+                elif default == "" or default is None:
+                    default_val = "-"
+                else:
+                    default_val = default
+
+                row_data = [col, col_type, key_val, nullable, default_val, extra if extra else "-", comment]
+
+                link = None
+                ref = fk_map.get((table, col))
+                if ref is not None:
+                    ref_table, ref_col = ref
+                    row_data[6] = f"FK → {ref_table}.{ref_col}"
+                    # None for cross-database references, which have no
+                    # sheet to link to
+                    link = sheet_anchor.get(ref_table)
+
+                col_widths = [
+                    max(w, len(v) if isinstance(v, str) else len(str(v)))
+                    for w, v in zip(col_widths, row_data)
+                ]
+                cells = [(v, STYLE_CELL) for v in row_data[:6]]
+                if link:
+                    cells.append((row_data[6], STYLE_HYPERLINK, link))
+                else:
+                    cells.append((row_data[6], STYLE_CELL))
+                rows.append(cells)
+
+            writer.set_col_widths([w + 2 for w in col_widths])
+            writer.add_row(
+                [(f"Physical Table Name: {table}", STYLE_TITLE)] + [None] * 7
+                + [("🏠 Home", STYLE_HYPERLINK, _sheet_anchor("Tables"))]
+            )
+            writer.add_row([])
+            writer.add_row([(h, STYLE_HEADER) for h in headers])
+            for cells in rows:
+                writer.add_row(cells)
+            writer.close()
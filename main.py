@@ -5,9 +5,13 @@ This script acts as the entry point, handling command-line arguments and
 orchestrating the database query and Excel generation processes.
 """
 import argparse
+import hashlib
+import logging
+import os
 import sys
 from db_utils import get_tables, get_foreign_key_map
 from excel_generator import generate_excel_doc
+from excel_generator_fast import generate_excel_doc_fast
 
 def parse_arguments():
     """
@@ -44,12 +48,36 @@ def parse_arguments():
         default="db_doc.xlsx",
         help='Path and name for the output Excel file. (Default: db_doc.xlsx)'
     )
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help='Use the direct-XML writer instead of openpyxl. '
+             'Recommended for schemas with thousands of tables.'
+    )
     return parser.parse_args()
 
+def schema_etag(tables, fk_map):
+    """
+    Hashes the table list and foreign-key map into a short content tag.
+
+    Args:
+        tables (list): A list of table names.
+        fk_map (dict): A dictionary mapping foreign key columns to their referenced tables/columns.
+
+    Returns:
+        str: A hex digest identifying the schema content.
+    """
+    return hashlib.blake2b(
+        repr(sorted(tables)).encode('utf-8')
+        + repr(sorted(fk_map.items())).encode('utf-8')
+    ).hexdigest()
+
 def main():
     """
     Main function to execute the database documentation process.
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     try:
         # Parse arguments from the command line
         args = parse_arguments()
@@ -61,19 +89,39 @@ def main():
 
         print(f"📊 Generating Excel documentation for database '{db_name}'...")
 
-        # Step 1: Get table names and foreign key relationships
+        # Step 1: Get table names and foreign key relationships. Both
+        # getters route through the shared MySQLSession, which serializes
+        # queries on its lock, so there is nothing to gain from threading
+        # them.
         tables = get_tables(db_container, db_user, db_pass, db_name)
+        fk_map = get_foreign_key_map(db_container, db_user, db_pass, db_name)
+
         if not tables:
             print("No tables found in the database. Exiting.")
             sys.exit(1)
 
-        fk_map = get_foreign_key_map(db_container, db_user, db_pass, db_name)
+        # Short-circuit when the schema content matches the previous run
+        # and the workbook is still in place
+        etag = schema_etag(tables, fk_map)
+        etag_file = f"{output_file}.etag"
+        if os.path.exists(output_file):
+            try:
+                with open(etag_file, encoding='utf-8') as f:
+                    if f.read().strip() == etag:
+                        print(f"✅ {output_file} is up to date; nothing to do.")
+                        return
+            except OSError:
+                pass
 
         # Step 2: Generate the Excel workbook
-        generate_excel_doc(
+        generator = generate_excel_doc_fast if args.fast else generate_excel_doc
+        generator(
             output_file, db_container, db_user, db_pass, db_name, tables, fk_map
         )
 
+        with open(etag_file, "w", encoding='utf-8') as f:
+            f.write(etag)
+
         print(f"✅ Database documentation generated: {output_file}")
 
     except Exception as e: